@@ -0,0 +1,64 @@
+
+# C declarations for _keyboard_hot.py (Cython pure Python mode)
+
+cimport cython
+
+cdef int _LUT_MAX
+
+
+cdef class PulseState:
+	cdef public object key
+	cdef public str mode
+	cdef public bint pressed
+	cdef public bint held
+	cdef public long long last_pulse_time
+	cdef public long long release_due
+
+
+cdef class InterpolatedKeyController:
+	cdef public object kb
+	cdef object _press
+	cdef object _release
+	cdef public double press_ms
+	cdef public double min_hz
+	cdef public double max_hz
+	cdef public double deadzone
+	cdef public double hold_threshold
+	cdef public double ema_alpha
+	cdef public bint active
+	cdef public long long down
+	cdef public list states
+	cdef public list filtered
+	cdef list _press_ns
+	cdef list _deadzone
+	cdef list _hold_threshold
+	cdef list _unit_scale
+	cdef list _interval_lut
+	cdef list _ema_alpha
+	cdef list _ema_keep
+
+	cpdef void _ensure_released(self, PulseState st)
+
+	@cython.locals(st=PulseState, down="long long", low="long long")
+	cpdef void release_all(self)
+
+	@cython.locals(
+		st=PulseState,
+		i=Py_ssize_t,
+		bit="long long",
+		press_mask="long long",
+		release_mask="long long",
+		pressed=bint,
+		held=bint,
+		active=bint,
+		mag=double,
+		deadzone=double,
+		hold_threshold=double,
+		unit=double,
+		interval="long long",
+		release_due="long long",
+	)
+	cpdef tuple update_all(self, raw_values, long long now)
+
+	@cython.locals(low="long long")
+	cpdef void apply(self, long long press_mask, long long release_mask)
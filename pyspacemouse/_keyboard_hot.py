@@ -0,0 +1,281 @@
+# cython: language_level=3, annotation_typing=False
+"""Per-frame axis -> key state machine of the keyboard bridge (pyspacemouse_keyboard).
+
+Kept free of pynput and other imports so it can be compiled with Cython in pure
+Python mode; the C types live in _keyboard_hot.pxd. Without a compiled module
+this file is imported as plain Python.
+"""
+
+from typing import Any, List, Optional, Sequence, Tuple
+
+# Highest bucket index of the per-axis pulse interval tables (256 entries)
+_LUT_MAX = 255
+
+
+class PulseState:
+	"""Key state of one axis; __slots__ keeps attribute access off a per-instance dict"""
+	__slots__ = ('key', 'mode', 'pressed', 'held', 'last_pulse_time', 'release_due')
+
+	def __init__(
+		self,
+		key: Any,
+		mode: str = "pulse",  # 'pulse' or 'hold'
+		pressed: bool = False,
+		held: bool = False,
+		# time.monotonic_ns() timestamps
+		last_pulse_time: int = 0,
+		release_due: int = 0,
+	) -> None:
+		self.key = key
+		self.mode = mode
+		self.pressed = pressed
+		self.held = held
+		self.last_pulse_time = last_pulse_time
+		self.release_due = release_due
+
+	def __repr__(self) -> str:
+		return (
+			f"PulseState(key={self.key!r}, mode={self.mode!r}, pressed={self.pressed}, held={self.held}, "
+			f"last_pulse_time={self.last_pulse_time}, release_due={self.release_due})"
+		)
+
+
+class InterpolatedKeyController:
+	"""Convert analog axis magnitudes into keyboard pulses with speed control.
+
+	Strategy:
+	- Below deadzone: ensure key is released.
+	- Between deadzone..hold_threshold: generate short key pulses with a frequency
+	  proportional to the axis magnitude (duty-cycle control).
+	- Above hold_threshold: hold the key down continuously (smoother at high speeds).
+
+	Constructor arguments are the defaults for bind(); each axis may override them.
+	Axes are small ints (see Axis) bound in order 0, 1, 2, ... All axes advance
+	together in update_all(), which only computes the key transitions as
+	bitmasks (bit i = axis i); apply() sends them.
+	"""
+
+	def __init__(
+		self,
+		kb: Any,
+		press_ms: float = 0.02,
+		min_hz: float = 3.0,
+		max_hz: float = 25.0,
+		deadzone: float = 0.05,
+		hold_threshold: float = 0.9,
+		ema_alpha: float = 0.25,
+	) -> None:
+		self.kb = kb
+		self._press = kb.press
+		self._release = kb.release
+		self.press_ms = press_ms
+		self.min_hz = min_hz
+		self.max_hz = max_hz
+		self.deadzone = deadzone
+		self.hold_threshold = hold_threshold
+		self.ema_alpha = ema_alpha
+		# False once every axis is below its deadzone with its key released
+		self.active = False
+		# Bit i set while the key of axis i is down
+		self.down = 0
+		# Per-axis data as parallel lists indexed by axis number
+		self.states: List[PulseState] = []
+		self.filtered: List[float] = []
+		self._press_ns: List[int] = []
+		self._deadzone: List[float] = []
+		self._hold_threshold: List[float] = []
+		self._unit_scale: List[float] = []  # 1 / (hold_threshold - deadzone)
+		self._interval_lut: List[List[int]] = []  # pulse interval (ns) per magnitude bucket
+		self._ema_alpha: List[float] = []
+		self._ema_keep: List[float] = []  # 1 - ema_alpha
+
+	def bind(
+		self,
+		axis: int,
+		key: Any,
+		mode: str = "pulse",
+		press_ms: Optional[float] = None,
+		min_hz: Optional[float] = None,
+		max_hz: Optional[float] = None,
+		deadzone: Optional[float] = None,
+		hold_threshold: Optional[float] = None,
+		ema_alpha: Optional[float] = None,
+	) -> int:
+		"""Bind (or rebind) an axis to a key and return its index; new axes must be bound in index order"""
+		if mode not in ("pulse", "hold"):
+			mode = "pulse"
+		index = int(axis)
+		if index > len(self.states):
+			raise ValueError(f"axis {index} bound before axis {len(self.states)}")
+		st = PulseState(key=key, mode=mode)
+		if index < len(self.states):
+			self.states[index] = st
+			self.filtered[index] = 0.0
+		else:
+			self.states.append(st)
+			self.filtered.append(0.0)
+			for params in (self._press_ns, self._deadzone, self._hold_threshold, self._unit_scale,
+						   self._interval_lut, self._ema_alpha, self._ema_keep):
+				params.append(None)
+		self._press_ns[index] = int((self.press_ms if press_ms is None else press_ms) * 1e9)
+		self._deadzone[index] = self.deadzone if deadzone is None else deadzone
+		self._hold_threshold[index] = self.hold_threshold if hold_threshold is None else hold_threshold
+		self._unit_scale[index] = 1.0 / max(1e-6, self._hold_threshold[index] - self._deadzone[index])
+		# Pulse frequency maps [deadzone, hold_threshold] -> [min_hz, max_hz]; the
+		# parameters are fixed from here on, so tabulate the resulting intervals
+		if min_hz is None:
+			min_hz = self.min_hz
+		if max_hz is None:
+			max_hz = self.max_hz
+		self._interval_lut[index] = [
+			int(1e9 / max(1e-6, min_hz + (bucket / _LUT_MAX) * (max_hz - min_hz)))
+			for bucket in range(_LUT_MAX + 1)
+		]
+		self._ema_alpha[index] = self.ema_alpha if ema_alpha is None else ema_alpha
+		self._ema_keep[index] = 1.0 - self._ema_alpha[index]
+		return index
+
+	def _ensure_released(self, st: PulseState) -> None:
+		if st.pressed or st.held:
+			try:
+				self.kb.release(st.key)
+			except Exception:
+				pass
+			self.down &= ~(1 << self.states.index(st))
+		st.pressed = False
+		st.held = False
+		st.release_due = 0
+
+	def release_all(self) -> None:
+		"""Release every key that is down"""
+		states = self.states
+		down = self.down
+		self.down = 0
+		while down:
+			low = down & -down
+			st = states[low.bit_length() - 1]
+			try:
+				self._release(st.key)
+			except Exception:
+				pass
+			st.pressed = False
+			st.held = False
+			down ^= low
+
+	def update_all(self, raw_values: Sequence[float], now: int) -> Tuple[int, int]:
+		"""Advance every bound axis by one frame.
+
+		raw_values holds one magnitude per axis, indexed by axis, and now is a
+		time.monotonic_ns() timestamp. Returns (press_mask, release_mask) for
+		apply(); PulseState is already updated.
+		"""
+		press_mask = 0
+		release_mask = 0
+		active = False
+		filtered = self.filtered
+		press_ns = self._press_ns
+		unit_scales = self._unit_scale
+		interval_luts = self._interval_lut
+		deadzones = self._deadzone
+		hold_thresholds = self._hold_threshold
+
+		# EMA smoothing to reduce jitter, every axis in one pass
+		filtered[:] = [
+			alpha * raw + keep * prev
+			for alpha, keep, raw, prev in zip(self._ema_alpha, self._ema_keep, raw_values, filtered)
+		]
+
+		for i, st in enumerate(self.states):
+			mag = abs(filtered[i])
+			deadzone = deadzones[i]
+			pressed = st.pressed
+			held = st.held
+
+			# Idle axis (most of them at any time): nothing to release or start
+			if mag <= deadzone and not pressed and not held:
+				continue
+
+			bit = 1 << i
+
+			# Release opposite direction if needed (handled by caller passing 0.0)
+
+			if mag <= deadzone:
+				# fully released below deadzone
+				if held:
+					st.pressed = st.held = False
+					st.release_due = 0
+					release_mask |= bit
+				elif pressed:
+					if now >= st.release_due:
+						st.pressed = False
+						release_mask |= bit
+					else:
+						active = True
+				continue
+
+			active = True
+
+			hold_threshold = hold_thresholds[i]
+			# Always continuous in hold mode; in pulse mode hold on strong input
+			# to keep motion smooth in-game
+			if st.mode == "hold" or mag >= hold_threshold:
+				if not held:
+					st.held = True
+					if not pressed:
+						st.pressed = True
+						press_mask |= bit
+				continue
+
+			# In pulsing range: ensure we're not in hold mode
+			if held:
+				st.held = False
+				if pressed:
+					pressed = st.pressed = False
+					release_mask |= bit
+
+			# Look up the pulse interval for this magnitude
+			unit = (mag - deadzone) * unit_scales[i]
+			unit = 0.0 if unit < 0.0 else 1.0 if unit > 1.0 else unit
+			interval = interval_luts[i][int(unit * _LUT_MAX)]
+
+			# Start a new pulse if interval elapsed
+			release_due = st.release_due
+			if now - st.last_pulse_time >= interval:
+				release_due = st.release_due = now + press_ns[i]
+				st.last_pulse_time = now
+				if not pressed:
+					pressed = st.pressed = True
+					press_mask |= bit
+
+			# End pulse if its on-time elapsed
+			if pressed and now >= release_due:
+				st.pressed = False
+				if press_mask & bit:
+					# zero-length pulse: never send it
+					press_mask ^= bit
+				else:
+					release_mask |= bit
+
+		self.active = active
+		return press_mask, release_mask
+
+	def apply(self, press_mask: int, release_mask: int) -> None:
+		"""Send the key transitions computed by update_all(), releases first"""
+		press = self._press
+		release = self._release
+		states = self.states
+		self.down = (self.down & ~release_mask) | press_mask
+		while release_mask:
+			low = release_mask & -release_mask
+			try:
+				release(states[low.bit_length() - 1].key)
+			except Exception:
+				pass
+			release_mask ^= low
+		while press_mask:
+			low = press_mask & -press_mask
+			try:
+				press(states[low.bit_length() - 1].key)
+			except Exception:
+				pass
+			press_mask ^= low
@@ -0,0 +1,98 @@
+"""Key event output of the keyboard bridge (pyspacemouse_keyboard).
+
+A sender has the press()/release() interface of pynput.keyboard.Controller plus
+flush(). On Windows the events of a frame are queued and sent with a single
+SendInput call on flush(); elsewhere they go straight to pynput.
+"""
+
+import ctypes
+from typing import Any, Dict, Optional, Tuple
+
+import pynput.keyboard as keyboard
+
+# Windows: pynput's own SendInput bindings
+try:
+	from pynput._util.win32 import INPUT, INPUT_union, KEYBDINPUT, SendInput
+except Exception:
+	SendInput = None
+
+# Events queued before the batch is sent anyway
+_BATCH_SIZE = 32
+
+
+class PynputSender:
+	"""Send every event right away through a pynput Controller"""
+
+	def __init__(self, controller: Any) -> None:
+		self.press = controller.press
+		self.release = controller.release
+
+	def flush(self) -> None:
+		pass
+
+
+class SendInputSender:
+	"""Queue key events as prebuilt INPUT structures and send them in one SendInput call.
+
+	Keys SendInput cannot express (e.g. characters outside the BMP) go through the
+	pynput Controller, after the events queued before them.
+	"""
+
+	def __init__(self, controller: Any) -> None:
+		self._controller = controller
+		# key -> (key down INPUT, key up INPUT), None for keys left to pynput
+		self._inputs: Dict[Any, Optional[Tuple[Any, Any]]] = {}
+		self._batch = (INPUT * _BATCH_SIZE)()
+		self._count = 0
+
+	def press(self, key: Any) -> None:
+		self._queue(key, False)
+
+	def release(self, key: Any) -> None:
+		self._queue(key, True)
+
+	def flush(self) -> None:
+		if self._count:
+			SendInput(self._count, self._batch, ctypes.sizeof(INPUT))
+			self._count = 0
+
+	def _queue(self, key: Any, up: bool) -> None:
+		try:
+			inputs = self._inputs[key]
+		except KeyError:
+			inputs = self._inputs[key] = _key_inputs(key)
+		if inputs is None:
+			self.flush()
+			if up:
+				self._controller.release(key)
+			else:
+				self._controller.press(key)
+			return
+		if self._count == _BATCH_SIZE:
+			self.flush()
+		self._batch[self._count] = inputs[up]
+		self._count += 1
+
+
+def _key_inputs(key: Any) -> Optional[Tuple[Any, Any]]:
+	"""The (down, up) INPUT structures of key, None if SendInput cannot send it"""
+	try:
+		if isinstance(key, keyboard.Key):
+			code = key.value
+		elif isinstance(key, keyboard.KeyCode):
+			code = key
+		else:
+			code = keyboard.KeyCode.from_char(key)
+		return tuple(
+			INPUT(type=INPUT.KEYBOARD, value=INPUT_union(ki=KEYBDINPUT(**code._parameters(is_press))))
+			for is_press in (True, False)
+		)
+	except Exception:
+		return None
+
+
+def key_sender(controller: Any) -> Any:
+	"""The best sender for this platform, wrapping a pynput Controller"""
+	if SendInput is not None:
+		return SendInputSender(controller)
+	return PynputSender(controller)
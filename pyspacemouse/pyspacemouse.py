@@ -1,9 +1,23 @@
 from easyhid import Enumeration, HIDException
 from collections import namedtuple
+from itertools import repeat
+from operator import add, mul
+import struct
 import timeit
 import copy
 from typing import Callable, Union, List
 
+# easyhid's cffi bindings, to read reports into a reusable buffer (see DeviceSpec.read).
+# These are easyhid internals: anything missing here (or on the device, see
+# DeviceSpec.__read_report) falls back to the public HIDDevice.read()
+try:
+    from easyhid.easyhid import ffi as _hid_ffi, hidapi as _hidapi
+except ImportError:
+    _hid_ffi = _hidapi = None
+if not (hasattr(_hidapi, "hid_read") and hasattr(_hidapi, "hid_read_timeout")
+        and hasattr(_hid_ffi, "new") and hasattr(_hid_ffi, "buffer")):
+    _hid_ffi = _hidapi = None
+
 # current version number
 __version__ = "1.0.3"
 
@@ -102,9 +116,14 @@ class DeviceSpec(object):
         self.hid_id = hid_id
         self.led_id = led_id
         self.__mappings = mappings
-        self.button_mapping = button_mapping
-        self.axis_scale = axis_scale
+        self.__button_mapping = button_mapping
+        self.__axis_scale = axis_scale
         self.__bytes_to_read = self.__get_num_bytes_to_read()
+        self.__axis_decoders = self.__get_axis_decoders()
+        self.__button_decoders = self.__get_button_decoders()
+        # report buffer reused by read(), allocated on first use
+        self.__read_buffer = None
+        self.__read_view = None
 
         # self.led_usage = hid.get_full_usage_id(led_id[0], led_id[1])
         # initialise to a vector of 0s for each state
@@ -139,12 +158,68 @@ class DeviceSpec(object):
         self.set_nonblocking_loop = True
 
     def __get_num_bytes_to_read(self):
+        """Size of the longest report, up to the last byte any axis or button is read from"""
         byte_indices = []
         for value in self.__mappings.values():
             byte_indices.extend([value.byte1, value.byte2])
+        for value in self.__button_mapping:
+            if value.byte is not None:
+                byte_indices.append(value.byte)
 
         return max(byte_indices) + 1
 
+    def __get_axis_decoders(self):
+        """Group the axis mappings by channel: {channel: (unpack_from, offset, end, axes, names, scales)}
+
+        axes is a list of (name, scale, byte1, byte2) sorted by byte1, where scale is the
+        mapping's flip divided by axis_scale. When every axis of
+        a channel is a little-endian int16 (byte2 == byte1 + 1) and the axes do not
+        overlap, unpack_from is a bound struct.Struct.unpack_from decoding all of them in
+        one call from data[offset:end]; otherwise it is None and process() decodes the
+        axes one by one. names and scales are the columns of axes, in the same order.
+        """
+        channels = {}
+        for name, (chan, b1, b2, flip) in self.__mappings.items():
+            channels.setdefault(chan, []).append((name, flip / float(self.__axis_scale), b1, b2))
+
+        decoders = {}
+        for chan, axes in channels.items():
+            axes.sort(key=lambda axis: axis[2])
+            offset = pos = axes[0][2]
+            fmt = "<"
+            for _, _, b1, b2 in axes:
+                if b2 != b1 + 1 or b1 < pos:
+                    fmt = None
+                    break
+                # skip unused bytes between two axes
+                fmt += "x" * (b1 - pos) + "h"
+                pos = b2 + 1
+            unpack_from = struct.Struct(fmt).unpack_from if fmt else None
+            names = tuple(name for name, _, _, _ in axes)
+            scales = tuple(scale for _, scale, _, _ in axes)
+            decoders[chan] = (unpack_from, offset, pos, axes, names, scales)
+        return decoders
+
+    def __get_button_decoders(self):
+        """Group the button mapping by channel: {channel: (offset, end, buttons)}
+
+        The button bytes data[offset:end] of a report are read as one little-endian
+        integer; buttons is a list of (button index, bit position in that integer).
+        """
+        channels = {}
+        for button_index, (chan, byte, bit) in enumerate(self.__button_mapping):
+            # placeholder entries of devices without buttons have no channel
+            if chan is not None:
+                channels.setdefault(chan, []).append((button_index, byte, bit))
+
+        decoders = {}
+        for chan, buttons in channels.items():
+            offset = min(byte for _, byte, _ in buttons)
+            end = max(byte for _, byte, _ in buttons) + 1
+            shifts = [(button_index, (byte - offset) * 8 + bit) for button_index, byte, bit in buttons]
+            decoders[chan] = (offset, end, shifts)
+        return decoders
+
     def describe_connection(self):
         """Return string representation of the device, including
         the connection state"""
@@ -161,6 +236,26 @@ class DeviceSpec(object):
     def mappings(self, val):
         self.__mappings = val
         self.__bytes_to_read = self.__get_num_bytes_to_read()
+        self.__axis_decoders = self.__get_axis_decoders()
+
+    @property
+    def axis_scale(self):
+        return self.__axis_scale
+
+    @axis_scale.setter
+    def axis_scale(self, val):
+        self.__axis_scale = val
+        self.__axis_decoders = self.__get_axis_decoders()
+
+    @property
+    def button_mapping(self):
+        return self.__button_mapping
+
+    @button_mapping.setter
+    def button_mapping(self, val):
+        self.__button_mapping = val
+        self.__bytes_to_read = self.__get_num_bytes_to_read()
+        self.__button_decoders = self.__get_button_decoders()
 
     @property
     def connected(self):
@@ -209,9 +304,21 @@ class DeviceSpec(object):
             self.device.close()
             self.device = None
 
-    def read(self):
+    def read(self, timeout=None, drain=False):
         """Read data from SpaceMouse and return the current state of this navigation controller.
 
+        With drain, any motion-only reports already queued after the first report are read
+        as well, so a backlog of motion is caught up in a single call. Of such a run only
+        the last report of each channel is processed, so the callbacks do not see the
+        intermediate motion states. Reading stops after a button report, so every button
+        state is returned by a read() of its own.
+
+        Parameters:
+            timeout: wait at most this many milliseconds for a report, regardless of the
+                     nonblocking mode; None keeps the mode set by set_nonblocking_loop
+            drain: catch up queued motion reports as described above; by default one
+                   report is read and processed per call
+
         Returns:
             state: {t,x,y,z,pitch,yaw,roll,button} namedtuple
             None if the device is not open.
@@ -219,12 +326,68 @@ class DeviceSpec(object):
         if not self.connected:
             return None
         # read bytes from SpaceMouse
-        ret = self.device.read(self.__bytes_to_read)
+        ret = self.__read_report(timeout)
+        if not drain:
+            if ret:
+                self.process(ret)
+            return self.tuple_state
+        # latest motion-only report per channel read so far;
+        # copied, the read buffer is reused
+        motion = None
         # test for nonblocking read
-        if (ret):
-            self.process(ret)
+        while ret:
+            chan = ret[0]
+            if chan in self.__axis_decoders and chan not in self.__button_decoders:
+                if motion is None:
+                    motion = {}
+                motion[chan] = bytes(ret)
+            else:
+                # the motion before this report comes first
+                if motion is not None:
+                    for data in motion.values():
+                        self.process(data)
+                self.process(ret)
+                return self.tuple_state
+            # drain the queue without waiting
+            ret = self.__read_report(0)
+        if motion is not None:
+            for data in motion.values():
+                self.process(data)
         return self.tuple_state
 
+    def __read_report(self, timeout):
+        """Read one report like self.device.read() does, into a buffer kept between reads
+
+        Returns a memoryview of the buffer (zero-filled past the end of a short report,
+        as from easyhid) or None if nothing was read. Falls back to device.read() when
+        easyhid's hidapi bindings or the device's handle and open flag are not available.
+        """
+        size = self.__bytes_to_read
+        device = self.device
+        handle = getattr(device, "_device", None)
+        is_open = getattr(device, "_is_open", None)
+        if _hidapi is None or handle is None or is_open is None:
+            return device.read(size, timeout)
+        if not is_open:
+            raise HIDException("HIDDevice not open")
+
+        if self.__read_view is None or len(self.__read_view) != size:
+            self.__read_buffer = _hid_ffi.new("unsigned char[]", size)
+            self.__read_view = memoryview(_hid_ffi.buffer(self.__read_buffer))
+
+        if timeout is None:
+            bytes_read = _hidapi.hid_read(handle, self.__read_buffer, size)
+        else:
+            bytes_read = _hidapi.hid_read_timeout(handle, self.__read_buffer, size, timeout)
+
+        if bytes_read < 0:
+            raise HIDException("Failed to read from HID device: " + str(bytes_read))
+        elif bytes_read == 0:
+            return None
+        if bytes_read < size:
+            self.__read_view[bytes_read:] = bytes(size - bytes_read)
+        return self.__read_view
+
     def process(self, data):
         """
         Update the state based on the incoming data
@@ -248,25 +411,47 @@ class DeviceSpec(object):
         button_changed = False
         dof_changed = False
 
-        for name, (chan, b1, b2, flip) in self.__mappings.items():
-            if data[0] == chan:
-                dof_changed = True
-                #check if b1 or b2 is over the length of the data
-                if b1 < len(data) and b2 < len(data):
-                    self.dict_state[name] = (
-                            flip * to_int16(data[b1], data[b2]) / float(self.axis_scale)
-                    )
-
-        for button_index, (chan, byte, bit) in enumerate(self.button_mapping):
-            if data[0] == chan:
-                button_changed = True
-                # update the button vector
-                mask = 1 << bit
-                self.dict_state["buttons"][button_index] = (
-                    1 if (data[byte] & mask) != 0 else 0
-                )
-
-        self.dict_state["t"] = high_acc_clock()
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data)
+
+        decoder = self.__axis_decoders.get(data[0])
+        if decoder is not None:
+            dof_changed = True
+            unpack_from, offset, end, axes, names, scales = decoder
+            if unpack_from is not None and end <= len(data):
+                # all axes of this channel in one call, straight from the report buffer,
+                # scaled and stored without a Python-level loop; + 0.0 turns the -0.0 of an
+                # idle axis with a negative scale into 0.0
+                self.dict_state.update(zip(names, map(add, map(mul, unpack_from(data, offset), scales),
+                                                      repeat(0.0))))
+            else:
+                for name, scale, b1, b2 in axes:
+                    #check if b1 or b2 is over the length of the data
+                    if b1 < len(data) and b2 < len(data):
+                        if b2 == b1 + 1:
+                            value = int.from_bytes(data[b1:b2 + 1], "little", signed=True)
+                        else:
+                            value = to_int16(data[b1], data[b2])
+                        self.dict_state[name] = value * scale + 0.0
+
+        decoder = self.__button_decoders.get(data[0])
+        if decoder is not None:
+            button_changed = True
+            offset, end, shifts = decoder
+            button_state = self.dict_state["buttons"]
+            if end <= len(data):
+                # all button bits of this channel in one word
+                word = int.from_bytes(data[offset:end], "little")
+                for button_index, shift in shifts:
+                    button_state[button_index] = (word >> shift) & 1
+            else:
+                for button_index, (chan, byte, bit) in enumerate(self.__button_mapping):
+                    if data[0] == chan:
+                        # update the button vector
+                        mask = 1 << bit
+                        button_state[button_index] = 1 if (data[byte] & mask) != 0 else 0
+
+        now = self.dict_state["t"] = high_acc_clock()
 
         # must receive both parts of the 6DOF state before we return the state dictionary
         if len(self.dict_state) == 8:
@@ -282,9 +467,8 @@ class DeviceSpec(object):
 
         # only call the DoF callback_arr if the specific DoF state actually changed
         if self.dof_callback_arr and dof_changed:
-            # foreach all callbacks (DofCallback)
+            # foreach all callbacks (DofCallback), throttled against the report time
             for block_dof_callback in self.dof_callback_arr:
-                now = high_acc_clock()
                 axis_name = block_dof_callback.axis
                 if now >= self.dict_state_last[axis_name] + block_dof_callback.sleep:
                     axis_val = self.dict_state[axis_name]
@@ -755,14 +939,18 @@ def close():
         _active_device.close()
 
 
-def read():
+def read(timeout=None, drain=False):
     """Return the current state of the active navigation controller.
 
+    Parameters:
+        timeout: wait at most this many milliseconds for a report (see DeviceSpec.read)
+        drain: catch up queued motion reports in one call (see DeviceSpec.read)
+
     Returns:
         state: {t,x,y,z,pitch,yaw,roll,button} namedtuple
         None if the device is not open.
     """
-    return _active_device.read() if _active_device is not None else None
+    return _active_device.read(timeout, drain) if _active_device is not None else None
 
 
 def list_devices():
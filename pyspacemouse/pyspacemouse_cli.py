@@ -58,9 +58,9 @@ def test_connect_cli():
 
     try:
         while True:
-            state = read_mouse()
+            # wait in the HID read for the next report instead of polling
+            state = read_mouse(50)
             print(state.x, state.y, state.z)
-            time.sleep(0.01)
     except KeyboardInterrupt:
         print("KeyboardInterrupt: Exiting...")
     finally:
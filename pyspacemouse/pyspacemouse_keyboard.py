@@ -1,24 +1,70 @@
 
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import functools
+import json
 import os
 
 # Try to load config from YAML file
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'spacemouse_config.yaml')
-_user_config = None
-try:
-	import yaml
-	with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-		_user_config = yaml.safe_load(f)
-except Exception:
-	_user_config = None
+# Parsed copy of the YAML, reused while the YAML's mtime and size are the ones stored with it
+CONFIG_CACHE_PATH = CONFIG_PATH + '.json'
+
+
+@functools.lru_cache(maxsize=1)
+def _load_user_config():
+	"""Parse the user config once; None if it is missing or unreadable"""
+	try:
+		st = os.stat(CONFIG_PATH)
+	except OSError:
+		return None
+	# A restored YAML can be older than the cache, so only an exact match counts
+	try:
+		with open(CONFIG_CACHE_PATH, 'r', encoding='utf-8') as f:
+			cached = json.load(f)
+		if cached['mtime_ns'] == st.st_mtime_ns and cached['size'] == st.st_size:
+			return cached['config']
+	except (OSError, ValueError, TypeError, KeyError):
+		pass
+
+	try:
+		import yaml
+		# Prefer the libyaml-backed loader when PyYAML was built with it
+		try:
+			from yaml import CSafeLoader as _Loader
+		except ImportError:
+			from yaml import SafeLoader as _Loader
+		with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+			config = yaml.load(f, Loader=_Loader)
+	except Exception:
+		return None
+
+	# Best effort: the YAML may hold values JSON cannot store (dates, sets), and the
+	# package folder may be read-only. The cache is written to a file of this process
+	# and moved into place, so no reader ever sees it half written.
+	try:
+		data = json.dumps({'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'config': config})
+	except (TypeError, ValueError):
+		return config
+	tmp_path = '%s.%d.tmp' % (CONFIG_CACHE_PATH, os.getpid())
+	try:
+		with open(tmp_path, 'w', encoding='utf-8') as f:
+			f.write(data)
+		os.replace(tmp_path, CONFIG_CACHE_PATH)
+	except OSError:
+		try:
+			os.remove(tmp_path)
+		except OSError:
+			pass
+	return config
 
 
 # ===== User-configurable settings (from config file if present) =====
 
-def _cfg(path, default, typ=None):
-	c = _user_config
+def _cfg(user_config, path, default, typ=None):
+	c = user_config
 	for p in path.split('.'):
 		if c is None or p not in c:
 			return default
@@ -32,40 +78,74 @@ def _cfg(path, default, typ=None):
 			return default
 	return c
 
-# Cast to correct type for safety
-INVERT_X = _cfg('invert_x', False, bool)
-INVERT_Y = _cfg('invert_y', True, bool)
-INVERT_Z = _cfg('invert_z', True, bool)
-INVERT_YAW = _cfg('invert_yaw', True, bool)
-SWAP_Y_Z = _cfg('swap_y_z', False, bool)
-
-MOVE_PRESS_MS = _cfg('move.press_ms', 0.020, float)
-MOVE_MIN_HZ = _cfg('move.min_hz', 15.0, float)
-MOVE_MAX_HZ = _cfg('move.max_hz', 30.0, float)
-MOVE_DEADZONE = _cfg('move.deadzone', 0.001, float)
-MOVE_HOLD_THRESHOLD = _cfg('move.hold_threshold', 0.40, float)
-MOVE_EMA_ALPHA = _cfg('move.ema_alpha', 0.3, float)
-
-ZOOM_PRESS_MS = _cfg('zoom.press_ms', 0.010, float)
-ZOOM_MIN_HZ = _cfg('zoom.min_hz', 8.0, float)
-ZOOM_MAX_HZ = _cfg('zoom.max_hz', 18.0, float)
-ZOOM_DEADZONE = _cfg('zoom.deadzone', 0.001, float)
-ZOOM_HOLD_THRESHOLD = _cfg('zoom.hold_threshold', 0.5, float)
-ZOOM_EMA_ALPHA = _cfg('zoom.ema_alpha', 0.3, float)
-
-# Mode settings
-MODE_TOGGLE_KEY = _cfg('mode.toggle_key', 'caps_lock')
-MODE_SYNC_WITH_CAPSLOCK_LED = _cfg('mode.sync_with_capslock_led', True, bool)
-MODE_START_IN_CHARACTER_MODE = _cfg('mode.start_in_character_mode', False, bool)
-
-# Mode settings
-MODE_TOGGLE_KEY = _cfg('mode.toggle_key', 'caps_lock')
-MODE_SYNC_WITH_CAPSLOCK_LED = _cfg('mode.sync_with_capslock_led', True, bool)
-MODE_START_IN_CHARACTER_MODE = _cfg('mode.start_in_character_mode', False, bool)
+
+@dataclass
+class Config:
+	"""Settings for the keyboard bridge, defaults match spacemouse_config.yaml"""
+	invert_x: bool = False
+	invert_y: bool = True
+	invert_z: bool = True
+	invert_yaw: bool = True
+	swap_y_z: bool = False
+
+	move_press_ms: float = 0.020
+	move_min_hz: float = 15.0
+	move_max_hz: float = 30.0
+	move_deadzone: float = 0.001
+	move_hold_threshold: float = 0.40
+	move_ema_alpha: float = 0.3
+
+	zoom_press_ms: float = 0.010
+	zoom_min_hz: float = 8.0
+	zoom_max_hz: float = 18.0
+	zoom_deadzone: float = 0.001
+	zoom_hold_threshold: float = 0.5
+	zoom_ema_alpha: float = 0.3
+
+	# Mode settings
+	mode_toggle_key: str = 'caps_lock'
+	mode_sync_with_capslock_led: bool = True
+	mode_start_in_character_mode: bool = False
+
+	# Raw 'axes' / 'buttons' sections, resolved to keys in main()
+	axes: Optional[Dict[str, Any]] = None
+	buttons: Optional[Dict[Any, Any]] = None
+
+
+def load_config() -> Config:
+	"""Build a Config from spacemouse_config.yaml (parsed lazily, on first call)"""
+	c = _load_user_config()
+	# Cast to correct type for safety
+	return Config(
+		invert_x=_cfg(c, 'invert_x', False, bool),
+		invert_y=_cfg(c, 'invert_y', True, bool),
+		invert_z=_cfg(c, 'invert_z', True, bool),
+		invert_yaw=_cfg(c, 'invert_yaw', True, bool),
+		swap_y_z=_cfg(c, 'swap_y_z', False, bool),
+		move_press_ms=_cfg(c, 'move.press_ms', 0.020, float),
+		move_min_hz=_cfg(c, 'move.min_hz', 15.0, float),
+		move_max_hz=_cfg(c, 'move.max_hz', 30.0, float),
+		move_deadzone=_cfg(c, 'move.deadzone', 0.001, float),
+		move_hold_threshold=_cfg(c, 'move.hold_threshold', 0.40, float),
+		move_ema_alpha=_cfg(c, 'move.ema_alpha', 0.3, float),
+		zoom_press_ms=_cfg(c, 'zoom.press_ms', 0.010, float),
+		zoom_min_hz=_cfg(c, 'zoom.min_hz', 8.0, float),
+		zoom_max_hz=_cfg(c, 'zoom.max_hz', 18.0, float),
+		zoom_deadzone=_cfg(c, 'zoom.deadzone', 0.001, float),
+		zoom_hold_threshold=_cfg(c, 'zoom.hold_threshold', 0.5, float),
+		zoom_ema_alpha=_cfg(c, 'zoom.ema_alpha', 0.3, float),
+		mode_toggle_key=_cfg(c, 'mode.toggle_key', 'caps_lock'),
+		mode_sync_with_capslock_led=_cfg(c, 'mode.sync_with_capslock_led', True, bool),
+		mode_start_in_character_mode=_cfg(c, 'mode.start_in_character_mode', False, bool),
+		axes=_cfg(c, 'axes', None),
+		buttons=_cfg(c, 'buttons', None),
+	)
 # ===== End user-configurable settings =====
 
 # Use the library in this package
-from pyspacemouse import open as sm_open, read as sm_read, close as sm_close
+from pyspacemouse import open as sm_open, close as sm_close
+# PulseState is re-exported: it was defined in this module before
+from pyspacemouse._keyboard_hot import InterpolatedKeyController, PulseState  # noqa: F401
 
 try:
 	import pynput.keyboard as keyboard
@@ -74,196 +154,192 @@ except ImportError as e:
 		"Missing dependency: pynput. Install it with 'pip install pynput'"
 	) from e
 
-# CapsLock LED state detection
+from pyspacemouse._keyboard_send import key_sender
+
+# Config key names -> pynput keys ('esc' -> Key.esc); other names are characters
+_KEY_TABLE = dict(keyboard.Key.__members__)
+
+# CapsLock LED state detection (Windows only); resolve GetKeyState once
 try:
 	import ctypes
 	import ctypes.wintypes
+	_GetKeyState = ctypes.windll.user32.GetKeyState
+	_GetKeyState.argtypes = [ctypes.c_int]
+	_GetKeyState.restype = ctypes.c_short
 	_capslock_available = True
-except ImportError:
+except (ImportError, AttributeError, OSError):
 	_capslock_available = False
 
 def get_capslock_state():
 	"""Get CapsLock LED state on Windows"""
 	if not _capslock_available:
 		return False
-	try:
-		# VK_CAPITAL = 0x14 (CapsLock)
-		return bool(ctypes.windll.user32.GetKeyState(0x14) & 1)
-	except Exception:
-		return False
-
+	# VK_CAPITAL = 0x14 (CapsLock)
+	return bool(_GetKeyState(0x14) & 1)
 
-def clamp(v: float, lo: float, hi: float) -> float:
-	return max(lo, min(hi, v))
 
+class CapsLockWatcher:
+	"""Follow the CapsLock toggle from keyboard events instead of polling GetKeyState.
 
-@dataclass
-class PulseState:
-	key: Any
-	mode: str = "pulse"  # 'pulse' or 'hold'
-	pressed: bool = False
-	held: bool = False
-	last_pulse_time: float = 0.0
-	release_due: float = 0.0
-
-
-class InterpolatedKeyController:
-	"""Convert analog axis magnitudes into keyboard pulses with speed control.
-
-	Strategy:
-	- Below deadzone: ensure key is released.
-	- Between deadzone..hold_threshold: generate short key pulses with a frequency
-	  proportional to the axis magnitude (duty-cycle control).
-	- Above hold_threshold: hold the key down continuously (smoother at high speeds).
+	Uses a pynput Listener, which on Windows is a WH_KEYBOARD_LL hook running on its
+	own thread. Injected CapsLock presses (e.g. from a mapped button) are seen too.
+	The hook can miss events (UIPI, hook timeouts), so resync() should still be
+	called now and then to take the state from GetKeyState again.
 	"""
 
-	def __init__(
-		self,
-		kb: keyboard.Controller,
-		press_ms: float = 0.02,
-		min_hz: float = 3.0,
-		max_hz: float = 25.0,
-		deadzone: float = 0.05,
-		hold_threshold: float = 0.9,
-		ema_alpha: float = 0.25,
-	) -> None:
-		self.kb = kb
-		self.press_ms = press_ms
-		self.min_hz = min_hz
-		self.max_hz = max_hz
-		self.deadzone = deadzone
-		self.hold_threshold = hold_threshold
-		self.ema_alpha = ema_alpha
-		self.states: Dict[str, PulseState] = {}
-		self.filtered: Dict[str, float] = {}
-
-	def bind(self, name: str, key: Any, mode: str = "pulse") -> None:
-		if mode not in ("pulse", "hold"):
-			mode = "pulse"
-		self.states[name] = PulseState(key=key, mode=mode)
-		self.filtered[name] = 0.0
-
-	def _ensure_released(self, st: PulseState) -> None:
-		if st.pressed or st.held:
-			try:
-				self.kb.release(st.key)
-			except Exception:
-				pass
-		st.pressed = False
-		st.held = False
-		st.release_due = 0.0
-
-	def _press(self, st: PulseState) -> None:
-		if not st.pressed:
-			try:
-				self.kb.press(st.key)
-			except Exception:
-				pass
-			st.pressed = True
-
-	def _release(self, st: PulseState) -> None:
-		if st.pressed:
-			try:
-				self.kb.release(st.key)
-			except Exception:
-				pass
-			st.pressed = False
-
-	def update(self, name: str, raw_value: float, now: float) -> None:
-		if name not in self.states:
-			return
-		st = self.states[name]
-
-		# EMA smoothing to reduce jitter
-		prev = self.filtered.get(name, 0.0)
-		val = self.ema_alpha * raw_value + (1.0 - self.ema_alpha) * prev
-		self.filtered[name] = val
-
-		mag = abs(val)
-
-		# Release opposite direction if needed (handled by caller by not updating it)
-
-		if mag <= self.deadzone:
-			# fully released below deadzone
-			if st.held:
-				self._ensure_released(st)
-			elif st.pressed and now >= st.release_due:
-				self._release(st)
-			return
-
-		if st.mode == "hold":
-			# Always continuous when above deadzone
-			if not st.held:
-				self._press(st)
-				st.held = True
-			return
+	def __init__(self, on: bool) -> None:
+		self.on = on
+		self._held = False
+		self._listener = None
+
+	def start(self) -> bool:
+		"""Install the hook; False if it could not be installed"""
+		try:
+			self._listener = keyboard.Listener(on_press=self._on_press, on_release=self._on_release)
+			self._listener.daemon = True
+			self._listener.start()
+		except Exception:
+			self._listener = None
+			return False
+		return True
+
+	def stop(self) -> None:
+		if self._listener is not None:
+			self._listener.stop()
+			self._listener = None
+
+	def resync(self) -> None:
+		"""Take the toggle state from GetKeyState, in case the hook missed an event"""
+		self.on = get_capslock_state()
+
+	def _on_press(self, key: Any) -> None:
+		# Windows toggles on key down, like GetKeyState; a held key auto-repeats
+		# the down event, so only the first one counts
+		if key == keyboard.Key.caps_lock and not self._held:
+			self._held = True
+			self.on = not self.on
+
+	def _on_release(self, key: Any) -> None:
+		if key == keyboard.Key.caps_lock:
+			self._held = False
+
+
+def _send_keys(kb: Any, keys: Tuple[Any, ...], is_press: bool) -> None:
+	"""Press keys (a modifier combo when more than one) in order, or release them in reverse"""
+	try:
+		if is_press:
+			for k in keys:
+				kb.press(k)
 		else:
-			# pulse mode with high-magnitude hold
-			# Hold when strong input to keep motion smooth in-game
-			if mag >= self.hold_threshold:
-				if not st.held:
-					# switch from pulse to hold
-					self._press(st)
-					st.held = True
-				return
-
-			# In pulsing range: ensure we're not in hold mode
-			if st.held:
-				self._release(st)
-				st.held = False
-
-			# Compute pulse frequency from magnitude
-			# Map [deadzone, hold_threshold] -> [min_hz, max_hz]
-			span = max(1e-6, self.hold_threshold - self.deadzone)
-			unit = clamp((mag - self.deadzone) / span, 0.0, 1.0)
-			freq = self.min_hz + unit * (self.max_hz - self.min_hz)
-			interval = 1.0 / max(1e-6, freq)
-
-			# Start a new pulse if interval elapsed
-			if now - st.last_pulse_time >= interval:
-				self._press(st)
-				st.release_due = now + self.press_ms
-				st.last_pulse_time = now
-
-			# End pulse if its on-time elapsed
-			if st.pressed and now >= st.release_due:
-				self._release(st)
-
-
-def main(device: Optional[str] = None, invert_yaw: bool = True) -> None:
+			for k in reversed(keys):
+				kb.release(k)
+	except Exception:
+		pass
+
+
+class Axis(IntEnum):
+	"""Key axes of the bridge; the lower-case name is the key in the 'axes' config"""
+	MOVE_LEFT = 0
+	MOVE_RIGHT = 1
+	MOVE_FORWARD = 2
+	MOVE_BACKWARD = 3
+	ZOOM_IN = 4
+	ZOOM_OUT = 5
+	ROTATE_LEFT = 6
+	ROTATE_RIGHT = 7
+	PITCH_UP = 8
+	PITCH_DOWN = 9
+
+
+_MOVE_AXES = (Axis.MOVE_LEFT, Axis.MOVE_RIGHT, Axis.MOVE_FORWARD, Axis.MOVE_BACKWARD)
+_ZOOM_AXES = (Axis.ZOOM_IN, Axis.ZOOM_OUT)
+
+# Each key axis is driven by the positive part of raw axis * sign
+_AXIS_SOURCE = {
+	Axis.MOVE_LEFT: ('x', -1.0),        # X axis -> A/D
+	Axis.MOVE_RIGHT: ('x', 1.0),
+	Axis.MOVE_FORWARD: ('y', -1.0),     # Y axis -> W/S
+	Axis.MOVE_BACKWARD: ('y', 1.0),
+	Axis.ZOOM_IN: ('z', 1.0),           # Z -> PageUp/PageDown
+	Axis.ZOOM_OUT: ('z', -1.0),
+	Axis.ROTATE_LEFT: ('yaw', -1.0),    # Yaw (twist) -> rotate left/right
+	Axis.ROTATE_RIGHT: ('yaw', 1.0),
+	Axis.PITCH_UP: ('pitch', 1.0),
+	Axis.PITCH_DOWN: ('pitch', -1.0),
+}
+_RAW_AXES = ('x', 'y', 'z', 'yaw', 'pitch')
+
+# After a button's key goes down or up, changes of that button are held off for
+# this long; its state is taken again once the time is up
+_BUTTON_DEBOUNCE_NS = 50_000_000
+
+# HID read timeouts for the main loop
+_ACTIVE_READ_TIMEOUT_MS = 5
+_IDLE_READ_TIMEOUT_MS = 50
+
+# The CapsLock hook can miss events; its state is re-read from the LED this often
+_CAPSLOCK_RESYNC_NS = 50_000_000
+
+
+def _make_axis_splitter(axis_split: List[Tuple[int, int, int]]) -> Callable[[Any], List[float]]:
+	"""Generate split(state) -> per-key magnitudes, with axis_split unrolled into straight-line code.
+
+	axis_split holds (raw index, key axis when > 0, key axis when < 0) for each raw
+	axis; every other key axis reads 0.0.
+	"""
+	mags = [f"m{i}" for i in range(len(Axis))]
+	lines = ["def split(state):", f"\t{' = '.join(mags)} = 0.0"]
+	for j, up, down in axis_split:
+		lines += [
+			f"\tv = state.{_RAW_AXES[j]}",
+			"\tif v > 0.0:",
+			f"\t\tm{int(up)} = v",
+			"\telif v < 0.0:",
+			f"\t\tm{int(down)} = -v",
+		]
+	lines.append(f"\treturn [{', '.join(mags)}]")
+	namespace: Dict[str, Any] = {}
+	exec("\n".join(lines), namespace)
+	return namespace["split"]
+
+
+def main(device: Optional[str] = None, invert_yaw: bool = True, config: Optional[Config] = None) -> None:
 	print("SpaceMouse → Keyboard (interpolated) using pyspacemouse")
 	print("Press Ctrl+C to exit.")
 
+	if config is None:
+		config = load_config()
+
 	# Open SpaceMouse via library
 	if device is not None:
-		dev = sm_open(set_nonblocking_loop=True, device=device)
+		dev = sm_open(set_nonblocking_loop=False, device=device)
 	else:
 		# let pyspacemouse auto-pick the first supported device
-		dev = sm_open(set_nonblocking_loop=True)
+		dev = sm_open(set_nonblocking_loop=False)
 	if dev is None:
 		print("No SpaceMouse device opened.")
 		return
 
-	kb = keyboard.Controller()
-	# Movement controller (translation + rotation/pitch)
+	# Key events of a frame are sent together by kb.flush() (one SendInput call on Windows)
+	kb = key_sender(keyboard.Controller())
+	# One controller for all axes; movement settings are the defaults
 	ik = InterpolatedKeyController(
 		kb,
-		press_ms=MOVE_PRESS_MS,
-		min_hz=MOVE_MIN_HZ,
-		max_hz=MOVE_MAX_HZ,
-		deadzone=MOVE_DEADZONE,
-		hold_threshold=MOVE_HOLD_THRESHOLD,
-		ema_alpha=MOVE_EMA_ALPHA,
+		press_ms=config.move_press_ms,
+		min_hz=config.move_min_hz,
+		max_hz=config.move_max_hz,
+		deadzone=config.move_deadzone,
+		hold_threshold=config.move_hold_threshold,
+		ema_alpha=config.move_ema_alpha,
 	)
-	# Zoom controller with separate sensitivity
-	zoom_ik = InterpolatedKeyController(
-		kb,
-		press_ms=ZOOM_PRESS_MS,
-		min_hz=ZOOM_MIN_HZ,
-		max_hz=ZOOM_MAX_HZ,
-		deadzone=ZOOM_DEADZONE,
-		hold_threshold=ZOOM_HOLD_THRESHOLD,
-		ema_alpha=ZOOM_EMA_ALPHA,
+	# Zoom axes are bound with a separate sensitivity
+	zoom_params = dict(
+		press_ms=config.zoom_press_ms,
+		min_hz=config.zoom_min_hz,
+		max_hz=config.zoom_max_hz,
+		deadzone=config.zoom_deadzone,
+		hold_threshold=config.zoom_hold_threshold,
+		ema_alpha=config.zoom_ema_alpha,
 	)
 
 	# Axis-to-key mapping: load from config if present, else use defaults
@@ -279,38 +355,64 @@ def main(device: Optional[str] = None, invert_yaw: bool = True) -> None:
 		'pitch_up': 'up',
 		'pitch_down': 'down',
 	}
-	_cfg_axes = _cfg('axes', None)
+	_cfg_axes = config.axes
 	axis_mapping = {}
 	for k, v in _default_axis_mapping.items():
 		val = _cfg_axes.get(k, v) if _cfg_axes else v
 		# Convert string names to pynput keys if needed
-		axis_mapping[k] = getattr(keyboard.Key, val) if hasattr(keyboard.Key, val) else val
+		axis_mapping[k] = _KEY_TABLE.get(val, val)
 
 	# Mode detection: sync with CapsLock LED or manual toggle
-	character_mode = MODE_START_IN_CHARACTER_MODE
-	if MODE_SYNC_WITH_CAPSLOCK_LED and _capslock_available:
+	character_mode = config.mode_start_in_character_mode
+	capslock = None
+	if config.mode_sync_with_capslock_led and _capslock_available:
 		character_mode = get_capslock_state()
+		capslock = CapsLockWatcher(character_mode)
+		if not capslock.start():
+			capslock = None
 	
 	def get_movement_mode():
 		"""Return 'hold' for character mode (BG3WASD), 'pulse' for camera mode"""
 		nonlocal character_mode
-		if MODE_SYNC_WITH_CAPSLOCK_LED and _capslock_available:
+		if capslock is not None:
+			character_mode = capslock.on
+		elif config.mode_sync_with_capslock_led and _capslock_available:
 			character_mode = get_capslock_state()
 		return "hold" if character_mode else "pulse"
 
 	# Bind keys with initial mode
 	initial_mode = get_movement_mode()
-	ik.bind("move_left", axis_mapping['move_left'], mode=initial_mode)
-	ik.bind("move_right", axis_mapping['move_right'], mode=initial_mode)
-	ik.bind("move_forward", axis_mapping['move_forward'], mode=initial_mode)
-	ik.bind("move_backward", axis_mapping['move_backward'], mode=initial_mode)
-	zoom_ik.bind("zoom_in", axis_mapping['zoom_in'], mode="pulse")
-	zoom_ik.bind("zoom_out", axis_mapping['zoom_out'], mode="pulse")
-	# rotation (twist) and pitch: always continuous hold for smooth camera
-	ik.bind("rotate_left", axis_mapping['rotate_left'], mode="hold")
-	ik.bind("rotate_right", axis_mapping['rotate_right'], mode="hold")
-	ik.bind("pitch_up", axis_mapping['pitch_up'], mode="hold")
-	ik.bind("pitch_down", axis_mapping['pitch_down'], mode="hold")
+	for axis in Axis:
+		key = axis_mapping[axis.name.lower()]
+		if axis in _MOVE_AXES:
+			ik.bind(axis, key, mode=initial_mode)
+		elif axis in _ZOOM_AXES:
+			ik.bind(axis, key, mode="pulse", **zoom_params)
+		else:
+			# rotation (twist) and pitch: always continuous hold for smooth camera
+			ik.bind(axis, key, mode="hold")
+
+	# Fold the inversion flags and the optional Y/Z swap into which key axis
+	# each direction of a raw axis drives
+	invert = {
+		'x': config.invert_x,
+		'y': config.invert_y,
+		'z': config.invert_z,
+		'yaw': config.invert_yaw,
+		'pitch': False,
+	}
+	swap = {'y': 'z', 'z': 'y'} if config.swap_y_z else {}
+	positive = {}
+	negative = {}
+	for key_axis in Axis:
+		axis, sign = _AXIS_SOURCE[key_axis]
+		axis = swap.get(axis, axis)
+		if invert[axis]:
+			sign = -sign
+		(positive if sign > 0 else negative)[_RAW_AXES.index(axis)] = key_axis
+	# Every raw axis drives one key per direction:
+	# (raw index, key axis when > 0, key axis when < 0)
+	split_axes = _make_axis_splitter([(j, positive[j], negative[j]) for j in sorted(positive)])
 
 	# Track mode changes
 	last_mode = initial_mode
@@ -335,7 +437,7 @@ def main(device: Optional[str] = None, invert_yaw: bool = True) -> None:
 		14: ['shift', 'space'],         # Leave Turn-based Mode (Shift+Space)
 	}
 	# Load from config if present
-	_cfg_buttons = _cfg('buttons', None)
+	_cfg_buttons = config.buttons
 	button_mapping = {}
 	for idx in range(15):
 		val = None
@@ -347,150 +449,108 @@ def main(device: Optional[str] = None, invert_yaw: bool = True) -> None:
 			val = _default_button_mapping[idx]
 		# Convert string names to pynput keys if needed
 		if isinstance(val, list):
-			keys = []
-			for v in val:
-				k = getattr(keyboard.Key, v) if hasattr(keyboard.Key, v) else v
-				keys.append(k)
-			button_mapping[idx] = tuple(keys)
+			button_mapping[idx] = tuple(_KEY_TABLE.get(v, v) for v in val)
 		else:
-			button_mapping[idx] = getattr(keyboard.Key, val) if hasattr(keyboard.Key, val) else val
-
-	# Track last button states to detect rising edges
-	prev_buttons = [0] * 15
-
-	last_dir = {
-		"x": 0,
-		"y": 0,
-		"z": 0,
-		"yaw": 0,
-	}
+			button_mapping[idx] = _KEY_TABLE.get(val, val)
+
+	# Indexed by button: every mapping as a tuple of keys
+	button_keys = tuple(key if isinstance(key, tuple) else (key,) for key in button_mapping.values())
+	mapped_buttons = (1 << len(button_keys)) - 1
+
+	# Buttons whose keys are down (as a bitmask), when each button's debounce
+	# window ends, and whether some button still differs from its key
+	held_buttons = 0
+	settle_at = [0] * len(button_keys)
+	unsettled = 0
+	# When the CapsLock state is next re-read from the LED
+	capslock_resync_at = 0
+
+	# Names used every frame, as locals
+	read = dev.read
+	monotonic_ns = time.monotonic_ns
+	update_all = ik.update_all
+	apply = ik.apply
+	flush = kb.flush
 
 	try:
 		while True:
-			state = sm_read()
-			now = time.time()
+			# Block in the HID read until a report arrives. While pulses or EMA decay
+			# are in progress, wake up often enough to keep their timing; when idle
+			# the watchdog only wakes us to follow mode changes. Motion queued up
+			# behind a slow frame is caught up in the same read.
+			state = read(_ACTIVE_READ_TIMEOUT_MS if ik.active or unsettled else _IDLE_READ_TIMEOUT_MS, drain=True)
+			now = monotonic_ns()
 			if not state:
 				time.sleep(0.005)
 				continue
 
-			# Check for mode changes (CapsLock LED sync)
+			# Check for mode changes (CapsLock LED sync). The hook gives fast updates;
+			# the LED state is re-read every _CAPSLOCK_RESYNC_NS (every idle wakeup)
+			# in case it missed one.
+			if capslock is not None and now >= capslock_resync_at:
+				capslock_resync_at = now + _CAPSLOCK_RESYNC_NS
+				capslock.resync()
 			current_mode = get_movement_mode()
 			if current_mode != last_mode:
 				# Update movement key modes when CapsLock changes
-				ik.states["move_left"].mode = current_mode
-				ik.states["move_right"].mode = current_mode
-				ik.states["move_forward"].mode = current_mode
-				ik.states["move_backward"].mode = current_mode
-				# Ensure keys are released when switching modes
-				for name in ["move_left", "move_right", "move_forward", "move_backward"]:
-					ik._ensure_released(ik.states[name])
+				for axis in _MOVE_AXES:
+					st = ik.states[axis]
+					st.mode = current_mode
+					# Ensure keys are released when switching modes
+					ik._ensure_released(st)
 				last_mode = current_mode
 				print(f"Mode changed to: {'Character (BG3WASD)' if current_mode == 'hold' else 'Camera'}")
 
-			# Read raw axes
-			x = state.x
-			y = state.y
-			z = state.z
-			yaw = state.yaw
-			pitch = state.pitch
-
-			# Apply global inversion flags
-			if INVERT_X:
-				x = -x
-			if INVERT_Y:
-				y = -y
-			if INVERT_Z:
-				z = -z
-			# Keep CLI arg for yaw inversion but OR with config flag for convenience
-			if INVERT_YAW:
-				yaw = -yaw
-
-			# Optional swap of Y and Z roles (move vs zoom)
-			if SWAP_Y_Z:
-				y, z = z, y
-
-			# X axis -> A/D
-			if x >= 0:
-				ik.update("move_right", x, now)
-				# ensure opposite key is idle
-				ik.update("move_left", 0.0, now)
-			else:
-				ik.update("move_left", -x, now)
-				ik.update("move_right", 0.0, now)
-
-			# Y axis -> W/S
-			if y <= 0:
-				ik.update("move_forward", -y, now)
-				ik.update("move_backward", 0.0, now)
-			else:
-				ik.update("move_backward", y, now)
-				ik.update("move_forward", 0.0, now)
-
-			# Z -> PageUp/PageDown
-			if z >= 0:
-				zoom_ik.update("zoom_in", z, now)
-				zoom_ik.update("zoom_out", 0.0, now)
-			else:
-				zoom_ik.update("zoom_out", -z, now)
-				zoom_ik.update("zoom_in", 0.0, now)
-
-			# Yaw (twist) -> rotate left/right (continuous)
-			if yaw >= 0:
-				ik.update("rotate_right", yaw, now)
-				ik.update("rotate_left", 0.0, now)
-			else:
-				ik.update("rotate_left", -yaw, now)
-				ik.update("rotate_right", 0.0, now)
-
-			# Pitch (continuous)
-			if pitch >= 0:
-				ik.update("pitch_up", abs(pitch), now)
-				ik.update("pitch_down", 0.0, now)
-			else:
-				ik.update("pitch_down", abs(pitch), now)
-				ik.update("pitch_up", 0.0, now)
-
-			# Buttons: fire tap on rising edge
-			try:
-				btns = list(getattr(state, 'buttons', []))
-			except Exception:
-				btns = []
-			if btns:
-				# ensure prev_buttons has same length
-				if len(prev_buttons) != len(btns):
-					prev_buttons = [0] * len(btns)
-				for idx, val in enumerate(btns):
-					if val and not prev_buttons[idx]:
-						key = button_mapping.get(idx)
-						if key is not None:
-							try:
-								if isinstance(key, tuple):
-									# Modifier combo: press all, then release in reverse
-									for k in key:
-										kb.press(k)
-									time.sleep(0.005)
-									for k in reversed(key):
-										kb.release(k)
-								else:
-									kb.press(key)
-									time.sleep(0.005)
-									kb.release(key)
-							except Exception:
-								pass
-				prev_buttons = btns
-
-			time.sleep(0.005)
+			# Per-key magnitudes; the opposite key of each axis gets 0.0 so it goes idle
+			apply(*update_all(split_axes(state), now))
+
+			# Buttons: keys follow the buttons (bit i = button i). A change is sent
+			# right away, then the button is left alone for _BUTTON_DEBOUNCE_NS so
+			# contact bounce is ignored; a state that differs after that is sent then.
+			buttons = 0
+			for idx, val in enumerate(getattr(state, 'buttons', ())):
+				if val:
+					buttons |= 1 << idx
+			unsettled = (buttons ^ held_buttons) & mapped_buttons
+			if unsettled:
+				changed = 0
+				pending = unsettled
+				while pending:
+					low = pending & -pending
+					idx = low.bit_length() - 1
+					if now >= settle_at[idx]:
+						settle_at[idx] = now + _BUTTON_DEBOUNCE_NS
+						changed |= low
+					pending ^= low
+				released = changed & held_buttons
+				pressed = changed & buttons
+				held_buttons ^= changed
+				unsettled ^= changed
+				while released:
+					idx = (released & -released).bit_length() - 1
+					_send_keys(kb, button_keys[idx], False)
+					released &= released - 1
+				while pressed:
+					idx = (pressed & -pressed).bit_length() - 1
+					_send_keys(kb, button_keys[idx], True)
+					pressed &= pressed - 1
+			flush()
 
 	except KeyboardInterrupt:
 		pass
 	finally:
 		# Ensure all keys released
-		for st in list(ik.states.values()) + list(zoom_ik.states.values()):
-			try:
-				if st.pressed or st.held:
-					kb.release(st.key)
-			except Exception:
-				pass
+		ik.release_all()
+		while held_buttons:
+			idx = (held_buttons & -held_buttons).bit_length() - 1
+			_send_keys(kb, button_keys[idx], False)
+			held_buttons &= held_buttons - 1
+		try:
+			kb.flush()
+		except Exception:
+			pass
+		if capslock is not None:
+			capslock.stop()
 		try:
 			sm_close()
 		except Exception:
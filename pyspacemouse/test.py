@@ -1,6 +1,15 @@
 import pyspacemouse
+import sys
+import threading
 import time
 
+# Print positions at most this often (seconds)
+POSITION_PRINT_INTERVAL = 0.05
+_format_position = (
+    "Position: X={:+6.3f} Y={:+6.3f} Z={:+6.3f} | "
+    "Rotation: Roll={:+6.3f} Pitch={:+6.3f} Yaw={:+6.3f}\n"
+).format
+
 def main():
     """Simple test application for PySpaceMouse"""
     
@@ -20,19 +29,46 @@ def main():
     print(f"Found devices: {devices}")
     
     # Custom callback functions
+    last_position_print = 0.0
+    # latest state not printed yet, because it came too soon after the last print
+    pending_position = None
+
+    def print_position(state, now):
+        nonlocal last_position_print, pending_position
+        last_position_print = now
+        pending_position = None
+        sys.stdout.write(_format_position(state.x, state.y, state.z, state.roll, state.pitch, state.yaw))
+
     def position_callback(state):
-        """Callback for position/orientation changes"""
+        """Callback for position/orientation changes, printed at most every POSITION_PRINT_INTERVAL"""
+        nonlocal pending_position
         if state:
-            print(f"Position: X={state.x:+6.3f} Y={state.y:+6.3f} Z={state.z:+6.3f} | "
-                  f"Rotation: Roll={state.roll:+6.3f} Pitch={state.pitch:+6.3f} Yaw={state.yaw:+6.3f}")
+            now = time.monotonic()
+            if now - last_position_print < POSITION_PRINT_INTERVAL:
+                pending_position = state
+                return
+            print_position(state, now)
+
+    def flush_position():
+        """Print the held back state once POSITION_PRINT_INTERVAL has passed, so the last pose is shown"""
+        if pending_position is not None:
+            now = time.monotonic()
+            if now - last_position_print >= POSITION_PRINT_INTERVAL:
+                print_position(pending_position, now)
     
+    last_pressed_buttons = []
+
     def button_callback(state, buttons):
-        """Callback for button state changes"""
+        """Callback for button reports, printed only when the pressed buttons change"""
+        nonlocal last_pressed_buttons
         pressed_buttons = [i for i, pressed in enumerate(buttons) if pressed]
+        if pressed_buttons == last_pressed_buttons:
+            return
+        last_pressed_buttons = pressed_buttons
         if pressed_buttons:
-            print(f"Buttons pressed: {pressed_buttons}")
+            sys.stdout.write("Buttons pressed: " + str(pressed_buttons) + "\n")
         else:
-            print("All buttons released")
+            sys.stdout.write("All buttons released\n")
     
     # Try to open the device
     try:
@@ -40,7 +76,7 @@ def main():
         device = pyspacemouse.open(
             dof_callback=position_callback,
             button_callback=button_callback,
-            set_nonblocking_loop=True
+            set_nonblocking_loop=False
         )
         
         if device is None:
@@ -51,16 +87,33 @@ def main():
         print("\nMove the SpaceMouse or press buttons to see output...")
         print("Press Ctrl+C to exit\n")
         
-        # Main loop - just keep the program running
-        # The callbacks will handle the output automatically
+        # Read the device from a worker thread, which waits in the HID read
+        # until a report arrives; the callbacks handle the output
+        stop = threading.Event()
+        # exception that ended the worker thread, raised again in this thread
+        read_error = []
+
+        def read_loop():
+            try:
+                while not stop.is_set():
+                    device.read(100)  # triggers the callbacks
+                    flush_position()
+            except Exception as e:
+                read_error.append(e)
+
+        reader = threading.Thread(target=read_loop, daemon=True)
+        reader.start()
         try:
-            while True:
-                # Read state (this triggers the callbacks)
-                state = device.read()
-                time.sleep(0.01)  # Small delay to prevent overwhelming the CPU
-                
+            # join() with a timeout so Ctrl+C is handled on every platform
+            while reader.is_alive():
+                reader.join(0.5)
         except KeyboardInterrupt:
             print("\nExiting...")
+        finally:
+            stop.set()
+            reader.join()
+        if read_error:
+            raise read_error[0]
     
     except Exception as e:
         print(f"Error: {e}")
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import os
 import setuptools
 import pathlib
 
@@ -9,6 +10,15 @@ HERE = pathlib.Path(__file__).parent
 # The text of the README file
 long_description = (HERE / "README.md").read_text()
 
+# Opt-in: PYSPACEMOUSE_CYTHON=1 compiles the keyboard bridge's per-frame hot path
+# (pyspacemouse/_keyboard_hot.py, typed by _keyboard_hot.pxd) with Cython.
+# Without it, or without Cython installed, the same module is used as plain Python.
+ext_modules = []
+if os.environ.get("PYSPACEMOUSE_CYTHON") == "1":
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(["pyspacemouse/_keyboard_hot.py"])
+
 setuptools.setup(
     name="pyspacemouse",
     version="1.1.4",
@@ -21,6 +31,7 @@ setuptools.setup(
     keywords="pyspacemouse, 3d, 6 DoF, HID, python, open-source, spacemouse, spacenavigator, 3dconnection, 3d-mouse",
     license="MIT",
     packages=["pyspacemouse"],
+    ext_modules=ext_modules,
     install_requires=[
         "easyhid",
     ],
@@ -0,0 +1,151 @@
+"""Profile-guided optimization (PGO) training workload for the keyboard bridge.
+
+The keyboard bridge (pyspacemouse_keyboard.main) spends its time in the CPython
+interpreter's dispatch loop, which is exactly what a PGO+LTO build of CPython
+speeds up. This script records a SpaceMouse session once and replays it through
+main() with the keyboard mocked out, so CPython can be trained on this project's
+own hot path:
+
+    # 1. record ~30 s of real input (needs a connected device)
+    python tools/pgo_train.py record trace.jsonl --seconds 30
+
+    # 2. build CPython, using the replay as the PGO training task
+    ./configure --enable-optimizations --with-lto \\
+        PROFILE_TASK="$PWD/tools/pgo_train.py replay $PWD/trace.jsonl --loops 20"
+    make
+
+The replay needs pyspacemouse, easyhid and pynput importable by the interpreter
+being built (e.g. via PYTHONPATH). It never opens a device or sends key events,
+and it replays recorded timestamps on a virtual clock so it finishes quickly.
+pynput is switched to its dummy backends, so the replay also runs on a headless
+build machine without an X display.
+"""
+
+import argparse
+import collections
+import itertools
+import json
+import os
+import sys
+import time
+import types
+
+# No real input backend is needed (or wanted) while replaying. This covers the
+# mouse too: importing pynput.keyboard imports pynput.mouse, whose xorg backend
+# fails without a display.
+os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+# Same fields as pyspacemouse.SpaceNavigator
+Frame = collections.namedtuple("Frame", ["t", "x", "y", "z", "roll", "pitch", "yaw", "buttons"])
+
+
+def record(path, seconds, device=None):
+    """Write every state read from the device during `seconds` to a JSON lines file"""
+    import pyspacemouse
+
+    if pyspacemouse.open(set_nonblocking_loop=False, device=device) is None:
+        print("No SpaceMouse device opened.")
+        return 1
+
+    print(f"Recording {seconds:.0f} s of SpaceMouse input to {path}, move the device...")
+    frames = 0
+    start = last = time.monotonic_ns()
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            while last - start < seconds * 1e9:
+                state = pyspacemouse.read(5)
+                now = time.monotonic_ns()
+                json.dump({
+                    "dt": now - last,
+                    "axes": [state.x, state.y, state.z, state.roll, state.pitch, state.yaw],
+                    "buttons": list(state.buttons),
+                }, f)
+                f.write("\n")
+                last = now
+                frames += 1
+    finally:
+        pyspacemouse.close()
+    print(f"Recorded {frames} frames.")
+    return 0
+
+
+class _ReplayClock:
+    """Stands in for the `time` module of the bridge, advanced by the recorded deltas"""
+
+    def __init__(self):
+        self.ns = time.monotonic_ns()
+
+    def monotonic_ns(self):
+        return self.ns
+
+    def sleep(self, seconds):
+        self.ns += int(seconds * 1e9)
+
+
+class _NullController:
+    """pynput.keyboard.Controller that drops every event"""
+
+    def press(self, key):
+        pass
+
+    def release(self, key):
+        pass
+
+
+def replay(path, loops):
+    """Run the keyboard bridge's main() over a recorded trace, `loops` times"""
+    from pyspacemouse import pyspacemouse_keyboard as bridge
+    from pyspacemouse._keyboard_send import PynputSender
+
+    with open(path, "r", encoding="utf-8") as f:
+        frames = [json.loads(line) for line in f if line.strip()]
+    if not frames:
+        print(f"No frames in {path}")
+        return 1
+
+    clock = _ReplayClock()
+    trace = itertools.chain.from_iterable(itertools.repeat(frames, loops))
+
+    def sm_read(timeout=None, drain=False):
+        try:
+            frame = next(trace)
+        except StopIteration:
+            # main() treats Ctrl+C as a clean exit
+            raise KeyboardInterrupt
+        clock.ns += frame["dt"]
+        return Frame(clock.ns, *frame["axes"], frame["buttons"])
+
+    bridge.sm_open = lambda **kwargs: types.SimpleNamespace(read=sm_read)
+    bridge.sm_close = lambda: None
+    bridge.time = clock
+    bridge.keyboard.Controller = _NullController
+    bridge.key_sender = PynputSender
+    bridge._capslock_available = False
+
+    start = time.perf_counter()
+    bridge.main(config=bridge.load_config())
+    print(f"Replayed {len(frames) * loops} frames in {time.perf_counter() - start:.2f} s")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PGO training workload for the SpaceMouse keyboard bridge")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="Record a trace from a connected SpaceMouse")
+    rec.add_argument("trace", help="Output JSON lines file")
+    rec.add_argument("--seconds", type=float, default=30.0, help="Recording length (default: 30)")
+    rec.add_argument("--device", default=None, help="Device name, default: first supported device")
+    rep = sub.add_parser("replay", help="Replay a trace through the keyboard bridge")
+    rep.add_argument("trace", help="Trace recorded with 'record'")
+    rep.add_argument("--loops", type=int, default=1, help="Replay the trace this many times (default: 1)")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        return record(args.trace, args.seconds, args.device)
+    return replay(args.trace, args.loops)
+
+
+if __name__ == "__main__":
+    sys.exit(main())